@@ -4,17 +4,21 @@ from __future__ import annotations
 import logging
 from uuid import uuid4
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from ..config import settings
-from ..database import session_scope
-from ..models import AppState, WatchlistEntry
+from ..database import get_async_session, get_session
+from ..models import AppState, DetectionEvent, WatchlistEntry
 from ..schemas import (
     AlarmState,
     CameraSettingsUpdate,
     CameraState,
-    DetectionRead,
-    DetectionResponse,
+    DetectionListResponse,
     WatchlistRead,
     WatchlistResponse,
 )
@@ -26,24 +30,53 @@ LOGGER = logging.getLogger(__name__)
 
 router = APIRouter()
 
+UPLOAD_CHUNK_SIZE = 1 << 16
+
+
+# Column projections for the list endpoints: selecting exactly what the
+# response needs skips ORM entity hydration and the Pydantic round-trip.
+_WATCHLIST_COLUMNS = (
+    WatchlistEntry.id,
+    WatchlistEntry.label,
+    WatchlistEntry.vehicle_type,
+    WatchlistEntry.color_name,
+    WatchlistEntry.model_name,
+    WatchlistEntry.has_logo,
+    WatchlistEntry.is_person,
+    WatchlistEntry.image_path,
+    WatchlistEntry.created_at,
+)
 
-def _get_watchlist_entry(entry_id: int) -> WatchlistEntry:
-    with session_scope() as session:
-        entry = session.query(WatchlistEntry).get(entry_id)
-        if entry is None:
-            raise HTTPException(status_code=404, detail="Entrada no encontrada")
-        session.expunge(entry)
-        return entry
+_DETECTION_COLUMNS = (
+    DetectionEvent.id,
+    DetectionEvent.watchlist_entry_id,
+    DetectionEvent.detected_label,
+    DetectionEvent.vehicle_type,
+    DetectionEvent.color_name,
+    DetectionEvent.model_name,
+    DetectionEvent.has_logo,
+    DetectionEvent.is_person,
+    DetectionEvent.match_score,
+    DetectionEvent.snapshot_path,
+    DetectionEvent.event_metadata,
+    DetectionEvent.created_at,
+)
 
 
 @router.get("/watchlist", response_model=WatchlistResponse)
-def list_watchlist_entries() -> WatchlistResponse:
-    entries = watchlist_service.list_watchlist()
-    return WatchlistResponse(items=[WatchlistRead.from_orm(entry) for entry in entries])
+async def list_watchlist_entries(
+    session: AsyncSession = Depends(get_async_session),
+) -> ORJSONResponse:
+    result = await session.execute(
+        select(*_WATCHLIST_COLUMNS).order_by(WatchlistEntry.created_at.desc())
+    )
+    # Returning a Response directly skips FastAPI's response-model
+    # re-validation; orjson encodes datetime values natively.
+    return ORJSONResponse({"items": [dict(row) for row in result.mappings()]})
 
 
 @router.post("/watchlist", response_model=WatchlistRead)
-def create_watchlist_item(
+async def create_watchlist_item(
     label: str,
     vehicle_type: str | None = None,
     color_name: str | None = None,
@@ -54,8 +87,13 @@ def create_watchlist_item(
 ) -> WatchlistRead:
     filename = f"{uuid4().hex}_{image.filename}"
     destination = settings.watchlist_dir / filename
-    destination.write_bytes(image.file.read())
-    entry = watchlist_service.create_watchlist_entry(
+    # Stream in chunks so multi-MB uploads never materialize in memory.
+    with destination.open("wb") as buffer:
+        while chunk := await image.read(UPLOAD_CHUNK_SIZE):
+            buffer.write(chunk)
+    # The service converts to the read schema inside its session.
+    return await run_in_threadpool(
+        watchlist_service.create_watchlist_entry,
         label=label,
         image_path=destination,
         vehicle_type=vehicle_type,
@@ -64,30 +102,42 @@ def create_watchlist_item(
         has_logo=has_logo,
         is_person=is_person,
     )
-    return WatchlistRead.from_orm(entry)
 
 
 @router.delete("/watchlist/{entry_id}")
-def delete_watchlist_item(entry_id: int) -> None:
-    _get_watchlist_entry(entry_id)
-    watchlist_service.delete_watchlist_entry(entry_id)
-
-
-@router.get("/detections", response_model=DetectionResponse)
-def list_detection_events(limit: int = 50) -> DetectionResponse:
-    events = events_service.list_events(limit=limit)
-    return DetectionResponse(items=[DetectionRead.from_orm(event) for event in events])
+def delete_watchlist_item(entry_id: int, session: Session = Depends(get_session)) -> None:
+    entry = session.get(WatchlistEntry, entry_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Entrada no encontrada")
+    session.delete(entry)
+    watchlist_service.watchlist_cache.invalidate()
+
+
+@router.get("/detections", response_model=DetectionListResponse)
+async def list_detection_events(
+    limit: int = 50, session: AsyncSession = Depends(get_async_session)
+) -> ORJSONResponse:
+    result = await session.execute(
+        select(*_DETECTION_COLUMNS)
+        .order_by(DetectionEvent.created_at.desc())
+        .limit(limit)
+    )
+    return ORJSONResponse({"items": [dict(row) for row in result.mappings()]})
 
 
 @router.get("/alarm", response_model=AlarmState)
-def alarm_state() -> AlarmState:
-    with session_scope() as session:
-        state = AppState.get_singleton(session)
-        session.expunge(state)
-        return AlarmState(
-            visual_alarm_active=state.visual_alarm_active,
-            last_alarm_at=state.last_alarm_at,
-        )
+async def alarm_state(session: AsyncSession = Depends(get_async_session)) -> AlarmState:
+    # Same fixed-PK row as AppState.get_singleton, so this bootstrap can
+    # never create a second state row the alarm writer does not update.
+    state = await session.get(AppState, AppState.SINGLETON_ID)
+    if state is None:
+        state = AppState(id=AppState.SINGLETON_ID)
+        session.add(state)
+        await session.flush()
+    return AlarmState(
+        visual_alarm_active=state.visual_alarm_active,
+        last_alarm_at=state.last_alarm_at,
+    )
 
 
 @router.get("/camera", response_model=CameraState)
@@ -4,14 +4,16 @@ from __future__ import annotations
 import os
 import secrets
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class AlarmSettings(BaseModel):
     """Configuration for audio/visual alarms and relay outputs."""
 
+    model_config = ConfigDict(frozen=True)
+
     sound_file: Optional[Path] = Field(
         default=None,
         description="Path to a WAV file that will be played when an alarm is triggered.",
@@ -37,6 +39,8 @@ class AlarmSettings(BaseModel):
 class CameraSettings(BaseModel):
     """Camera specific settings."""
 
+    model_config = ConfigDict(frozen=True)
+
     source: str = Field(
         default="0",
         description="VideoCapture source that OpenCV should use. \n"
@@ -46,15 +50,41 @@ class CameraSettings(BaseModel):
         default=2,
         description="Process only one out of every `frame_skip` frames to save CPU cycles.",
     )
+    backend: str = Field(
+        default="auto",
+        description="Capture backend. 'auto' tries a GStreamer pipeline for RTSP sources \n"
+        "(hardware decode when the platform provides it) and falls back to the default \n"
+        "OpenCV backend; 'gstreamer' forces the pipeline, 'opencv' never uses it.",
+    )
     min_confidence: float = Field(
         default=0.45,
         description="Minimum detection confidence required to consider a YOLO detection valid.",
     )
+    max_batch: int = Field(
+        default=8,
+        ge=1,
+        description="Maximum number of frames batched into a single model forward pass.",
+    )
+    model_precision: str = Field(
+        default="fp16",
+        pattern="^(fp32|fp16|int8)$",
+        description="Numeric precision for accelerated inference. 'fp16' halves memory \n"
+        "traffic on GPUs with no meaningful accuracy loss; 'int8' additionally requires \n"
+        "calibration against the stored watchlist images; 'fp32' disables both.",
+    )
+    snapshot_jpeg_quality: int = Field(
+        default=80,
+        ge=1,
+        le=100,
+        description="JPEG quality used when encoding detection snapshots.",
+    )
 
 
 class DatabaseSettings(BaseModel):
     """Database connection configuration."""
 
+    model_config = ConfigDict(frozen=True)
+
     url: str = Field(
         default=f"sqlite:///{Path(os.getenv('APP_STATE_DIR', '.')).resolve() / 'app.db'}",
         description="SQLAlchemy compatible database URL.",
@@ -64,6 +94,8 @@ class DatabaseSettings(BaseModel):
 class AppSettings(BaseModel):
     """Top level application settings container."""
 
+    model_config = ConfigDict(frozen=True)
+
     camera: CameraSettings = Field(default_factory=CameraSettings)
     database: DatabaseSettings = Field(default_factory=DatabaseSettings)
     alarm: AlarmSettings = Field(default_factory=AlarmSettings)
@@ -80,6 +112,17 @@ class AppSettings(BaseModel):
         default_factory=lambda: os.getenv("APP_SESSION_SECRET", secrets.token_urlsafe(48)),
         description="Secret key used to sign session cookies.",
     )
+    allowed_origins: List[str] = Field(
+        default_factory=lambda: [
+            origin.strip()
+            for origin in os.getenv(
+                "APP_ALLOWED_ORIGINS", "http://localhost,http://localhost:8000"
+            ).split(",")
+            if origin.strip()
+        ],
+        description="Origins allowed to make cross-origin requests to the API. \n"
+        "Comma separated list taken from APP_ALLOWED_ORIGINS.",
+    )
 
     def ensure_directories(self) -> None:
         """Create the directories used by the application if they do not exist."""
@@ -2,21 +2,134 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from .config import settings
 
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA busy_timeout=5000",
+)
+
 
 def _create_engine():
-    return create_engine(settings.database.url, connect_args={"check_same_thread": False})
+    if settings.database.url.startswith("sqlite"):
+        if ":memory:" in settings.database.url:
+            # In-memory databases exist per connection, so every session must
+            # share the single connection that holds the data.
+            engine = create_engine(
+                settings.database.url,
+                poolclass=StaticPool,
+                connect_args={"check_same_thread": False},
+            )
+        else:
+            # Sessions run concurrently here (event loop, threadpool, alarm
+            # and buffer threads); a shared connection would interleave their
+            # transactions. A small pool keeps connections warm instead —
+            # the WAL/busy_timeout pragmas below handle cross-writer safety.
+            engine = create_engine(
+                settings.database.url,
+                pool_size=5,
+                max_overflow=10,
+                connect_args={"check_same_thread": False},
+            )
+    else:
+        engine = create_engine(
+            settings.database.url,
+            pool_size=5,
+            max_overflow=10,
+            pool_recycle=3600,
+            pool_pre_ping=True,
+        )
+    if engine.dialect.name == "sqlite":
+        # WAL lets the API read while the detector runner commits, and
+        # synchronous=NORMAL drops the per-commit fsync that serialized the
+        # alarm/detection write path.
+        @event.listens_for(engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, _record):
+            cursor = dbapi_connection.cursor()
+            for pragma in _SQLITE_PRAGMAS:
+                cursor.execute(pragma)
+            cursor.close()
+
+    return engine
+
+
+def _async_database_url() -> str:
+    url = settings.database.url
+    if url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    return url
+
+
+def _create_async_engine():
+    url = _async_database_url()
+    if url.startswith("sqlite") and ":memory:" in url:
+        # Same rule as the sync engine: an in-memory database lives on one
+        # connection, so both engines must pin it or the async side would
+        # see a different (empty) database per connection.
+        async_engine = create_async_engine(url, poolclass=StaticPool)
+    else:
+        async_engine = create_async_engine(url)
+    if async_engine.dialect.name == "sqlite":
+
+        @event.listens_for(async_engine.sync_engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, _record):
+            cursor = dbapi_connection.cursor()
+            for pragma in _SQLITE_PRAGMAS:
+                cursor.execute(pragma)
+            cursor.close()
+
+    return async_engine
 
 
 engine = _create_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async counterpart used by the FastAPI routes so DB access does not tie up
+# threadpool workers; the detector runner keeps using the sync engine.
+async_engine = _create_async_engine()
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency yielding a request-scoped async session."""
+
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+def get_session() -> Generator:
+    """FastAPI dependency yielding a request-scoped sync session.
+
+    Routes that previously opened several ``session_scope`` blocks per
+    request share one session (and one commit) through this instead.
+    """
+
+    session = SessionLocal()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
 
 @contextmanager
 def session_scope() -> Generator:
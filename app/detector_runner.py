@@ -3,10 +3,16 @@ from __future__ import annotations
 
 import argparse
 import logging
-from datetime import datetime
+import os
+import threading
+import time
+from collections import deque
 from pathlib import Path
+from queue import Empty, Full, Queue
+from typing import Any, NamedTuple, Optional
 
 import cv2
+import numpy as np
 
 from .config import settings
 from .database import session_scope
@@ -14,6 +20,7 @@ from .models import AppState, WatchlistEntry
 from .services import events as events_service
 from .services.alarm import AlarmManager
 from .services.detector import VehicleDetector, save_detection_snapshot
+from .services.watchlist import watchlist_cache
 
 LOGGER = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -33,15 +40,98 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def load_watchlist(session) -> list[WatchlistEntry]:
-    entries = session.query(WatchlistEntry).all()
-    for entry in entries:
-        session.expunge(entry)
-    return entries
+#: Upper bound on frames waiting for snapshot encoding; bursts beyond it drop
+#: the oldest pending item instead of growing RAM with full-size frames.
+SNAPSHOT_QUEUE_SIZE = 8
+
+_QUEUE_STOP = object()
+
+
+class _SnapshotJob(NamedTuple):
+    frame: np.ndarray
+    bbox: np.ndarray
+    snapshot_file: Path
+    entry: WatchlistEntry
+    detected_label: str
+    match_score: float
+    confidence: float
+
+
+def _snapshot_worker(jobs: "Queue[Any]") -> None:
+    """Encode snapshots and persist detection events off the capture thread."""
+
+    while True:
+        job = jobs.get()
+        if job is _QUEUE_STOP:
+            jobs.task_done()
+            break
+        try:
+            save_detection_snapshot(job.frame, job.bbox, job.snapshot_file)
+            events_service.enqueue_detection(
+                watchlist_entry=job.entry,
+                detected_label=job.detected_label,
+                vehicle_type=job.entry.vehicle_type,
+                color_name=job.entry.color_name,
+                match_score=job.match_score,
+                snapshot_path=job.snapshot_file,
+                metadata={"confidence": job.confidence},
+            )
+        except Exception:  # pragma: no cover - never kill the worker
+            LOGGER.exception("No se pudo persistir la detección")
+        finally:
+            jobs.task_done()
+
+
+def _enqueue_snapshot(jobs: "Queue[Any]", job: _SnapshotJob) -> None:
+    try:
+        jobs.put_nowait(job)
+    except Full:
+        # Drop the oldest pending snapshot so a burst never blocks capture.
+        try:
+            jobs.get_nowait()
+            jobs.task_done()
+        except Empty:
+            pass
+        try:
+            jobs.put_nowait(job)
+        except Full:  # pragma: no cover - only under extreme contention
+            LOGGER.warning("Cola de capturas llena; se descartó una detección")
+
+
+#: GStreamer pipeline for RTSP sources. decodebin selects a hardware decoder
+#: (nvv4l2decoder, vaapidecode, ...) when the platform provides one, keeping
+#: H.264 decode off the CPU; appsink caps bound latency instead of buffering.
+RTSP_GSTREAMER_PIPELINE = (
+    "rtspsrc location={url} latency=100 ! rtph264depay ! h264parse ! decodebin ! "
+    "videoconvert ! video/x-raw,format=BGR ! appsink drop=true max-buffers=2"
+)
+
+
+def _open_capture(source) -> cv2.VideoCapture:
+    """Open the video source, preferring hardware-accelerated RTSP decode."""
+
+    use_gstreamer = (
+        isinstance(source, str)
+        and source.startswith("rtsp://")
+        and settings.camera.backend in ("auto", "gstreamer")
+    )
+    if use_gstreamer:
+        pipeline = RTSP_GSTREAMER_PIPELINE.format(url=source)
+        cap = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+        if cap.isOpened():
+            LOGGER.info("Captura RTSP a través de GStreamer")
+            return cap
+        cap.release()
+        if settings.camera.backend == "gstreamer":
+            raise RuntimeError(f"No se pudo abrir la tubería GStreamer para: {source}")
+        LOGGER.warning("GStreamer no disponible; se usará el backend por defecto de OpenCV")
+    return cv2.VideoCapture(source)
 
 
 def detection_loop(args: argparse.Namespace) -> None:
     detector = VehicleDetector(model_path=args.model, min_confidence=args.confidence)
+    # Pay tracing/autotune before the first real frame, not during it.
+    detector.warmup()
     alarm = AlarmManager(Path(args.sound) if args.sound else None, enable_audio=settings.alarm.enable_audio)
 
     source = args.source
@@ -49,43 +139,86 @@ def detection_loop(args: argparse.Namespace) -> None:
         source = int(source)
     except ValueError:
         pass
-    cap = cv2.VideoCapture(source)
+    cap = _open_capture(source)
     if not cap.isOpened():
         raise RuntimeError(f"No se pudo abrir la fuente de video: {source}")
 
     frame_index = 0
+    # Hoisted out of the loop: composing one f-string per event beats two
+    # PosixPath allocations per snapshot.
+    detections_dir = os.fspath(settings.detections_dir)
+    # Snapshot names reuse a per-second timestamp prefix plus a counter;
+    # strftime through the C locale machinery is measurably slow per match.
+    last_second = 0
+    timestamp_prefix = ""
+    sub_index = 0
     LOGGER.info("Iniciando monitoreo en %s", source)
     with session_scope() as session:
         AppState.get_singleton(session)
+    snapshot_jobs: "Queue[Any]" = Queue(maxsize=SNAPSHOT_QUEUE_SIZE)
+    worker = threading.Thread(target=_snapshot_worker, args=(snapshot_jobs,), daemon=True)
+    worker.start()
+
+    # Frames accumulate into one forward pass; the deadline bounds the extra
+    # latency batching can add (~one display interval per buffered frame).
+    frame_batch: "deque[np.ndarray]" = deque(maxlen=settings.camera.max_batch)
+    batch_deadline = 0.0
+    batch_budget = 0.033 * settings.camera.max_batch
+
+    def process_batch() -> None:
+        nonlocal last_second, timestamp_prefix, sub_index
+        frames = list(frame_batch)
+        frame_batch.clear()
+        if not frames:
+            return
+        watchlist, matrices = watchlist_cache.snapshot()
+        for frame, detections in zip(frames, detector.detect_batch(frames)):
+            matches = detector.match_detections(detections, watchlist, matrices=matrices)
+            for detection, entry, score, features in matches:
+                if entry is None:
+                    continue
+                second = int(time.time())
+                if second != last_second:
+                    last_second = second
+                    timestamp_prefix = time.strftime("%Y%m%dT%H%M%S", time.gmtime(second))
+                    sub_index = 0
+                sub_index += 1
+                snapshot_file = Path(
+                    f"{detections_dir}/{timestamp_prefix}_{sub_index:06d}_{entry.id}.jpg"
+                )
+                _enqueue_snapshot(
+                    snapshot_jobs,
+                    _SnapshotJob(
+                        frame=frame,
+                        bbox=detection.bbox,
+                        snapshot_file=snapshot_file,
+                        entry=entry,
+                        detected_label=detection.label,
+                        match_score=score,
+                        confidence=detection.confidence,
+                    ),
+                )
+                alarm.trigger(reason=f"Coincidencia con {entry.label}")
+
     try:
         while True:
             ret, frame = cap.read()
             if not ret:
                 LOGGER.warning("Fin del stream o error de lectura")
+                process_batch()
                 break
             frame_index += 1
             if args.frame_skip > 1 and frame_index % args.frame_skip != 0:
                 continue
-            with session_scope() as session:
-                watchlist = load_watchlist(session)
-            matches = detector.find_matches(frame, watchlist)
-            for detection, entry, score, features in matches:
-                if entry is None:
-                    continue
-                timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
-                snapshot_file = settings.detections_dir / f"{timestamp}_{entry.id}.jpg"
-                save_detection_snapshot(frame, detection.bbox, snapshot_file)
-                events_service.record_detection(
-                    watchlist_entry=entry,
-                    detected_label=detection.label,
-                    vehicle_type=entry.vehicle_type,
-                    color_name=entry.color_name,
-                    match_score=score,
-                    snapshot_path=snapshot_file,
-                    metadata={"confidence": detection.confidence},
-                )
-                alarm.trigger(reason=f"Coincidencia con {entry.label}")
+            frame_batch.append(frame)
+            if len(frame_batch) == 1:
+                batch_deadline = time.monotonic() + batch_budget
+            if len(frame_batch) == frame_batch.maxlen or time.monotonic() >= batch_deadline:
+                process_batch()
     finally:
+        snapshot_jobs.put(_QUEUE_STOP)
+        worker.join(timeout=5.0)
+        events_service.flush_detections()
         cap.release()
         LOGGER.info("Monitoreo finalizado")
 
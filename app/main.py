@@ -6,6 +6,7 @@ from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.responses import RedirectResponse
 from starlette.middleware.sessions import SessionMiddleware
@@ -21,16 +22,25 @@ logging.basicConfig(level=logging.INFO)
 
 Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="Sistema de vigilancia de vehículos")
+# orjson encodes datetime/UUID/numpy natively, skipping the stdlib
+# jsonable_encoder fallback on every response.
+app = FastAPI(
+    title="Sistema de vigilancia de vehículos",
+    default_response_class=ORJSONResponse,
+)
 app.include_router(api_router, prefix="/api")
 app.include_router(web_router)
 
+# An explicit origin list lets Starlette answer preflights from static
+# headers and cache them client-side; the wildcard forced per-request work
+# (and combined with credentials it was also insecure).
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=settings.allowed_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PATCH", "DELETE"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,
 )
 
 app.add_middleware(
@@ -40,9 +50,35 @@ app.add_middleware(
     same_site="lax",
 )
 
+class _ImmutableStaticFiles(StaticFiles):
+    """StaticFiles that marks responses as immutable.
+
+    Media filenames embed a UUID or timestamp and never change content, so
+    browsers can cache them for a year instead of revalidating per render.
+    """
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
 static_path = Path(__file__).resolve().parent / "web" / "static"
 app.mount("/static", StaticFiles(directory=str(static_path)), name="static")
 
+# Mounted StaticFiles serve media without entering a Python handler per
+# request; the mount names keep the url_for() calls in the templates working.
+app.mount(
+    "/media/watchlist",
+    _ImmutableStaticFiles(directory=str(settings.watchlist_dir)),
+    name="watchlist_image",
+)
+app.mount(
+    "/media/detections",
+    _ImmutableStaticFiles(directory=str(settings.detections_dir)),
+    name="detection_image",
+)
+
 
 @app.get("/")
 def index() -> RedirectResponse:
@@ -1,8 +1,9 @@
 """SQLAlchemy models for watchlist and detections."""
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Optional
+import threading
+from datetime import datetime, timezone
+from typing import ClassVar, Optional
 
 from sqlalchemy import (
     Boolean,
@@ -20,6 +21,15 @@ from sqlalchemy.orm import declarative_base, relationship
 Base = declarative_base()
 
 
+def utcnow() -> datetime:
+    """Naive UTC timestamp; ``datetime.utcnow`` is deprecated in Python 3.12+.
+
+    Kept naive so new rows compare cleanly against existing stored values.
+    """
+
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class WatchlistEntry(Base):
     __tablename__ = "watchlist_entries"
 
@@ -32,7 +42,8 @@ class WatchlistEntry(Base):
     is_person = Column(Boolean, default=False)
     image_path = Column(String(512), nullable=False)
     feature_vector = Column(JSON, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # Indexed: every listing orders by created_at DESC.
+    created_at = Column(DateTime, default=utcnow, index=True)
 
     detections = relationship("DetectionEvent", back_populates="watchlist_entry")
 
@@ -51,7 +62,8 @@ class DetectionEvent(Base):
     match_score = Column(Float, default=0.0)
     snapshot_path = Column(String(512), nullable=True)
     event_metadata = Column("metadata", JSON, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # Indexed: the recent-events query is ORDER BY created_at DESC LIMIT n.
+    created_at = Column(DateTime, default=utcnow, index=True)
 
     watchlist_entry = relationship("WatchlistEntry", back_populates="detections")
 
@@ -63,15 +75,25 @@ class AppState(Base):
     visual_alarm_active = Column(Boolean, default=False)
     last_alarm_at = Column(DateTime, nullable=True)
 
+    #: The singleton always lives at a fixed primary key, so lookups go
+    #: through ``session.get`` (identity-map hit, usually no SQL).
+    SINGLETON_ID: ClassVar[int] = 1
+    _singleton_lock: ClassVar[threading.Lock] = threading.Lock()
+
     @classmethod
     def get_singleton(cls, session) -> "AppState":
-        instance: Optional[AppState] = session.query(cls).first()
-        if instance is None:
-            instance = cls()
-            session.add(instance)
-            session.commit()
-            session.refresh(instance)
-        return instance
+        instance: Optional[AppState] = session.get(cls, cls.SINGLETON_ID)
+        if instance is not None:
+            return instance
+        with cls._singleton_lock:
+            instance = session.get(cls, cls.SINGLETON_ID)
+            if instance is None:
+                instance = cls(id=cls.SINGLETON_ID)
+                session.add(instance)
+                # flush() assigns the row inside the caller's transaction;
+                # the surrounding session scope owns the commit.
+                session.flush()
+            return instance
 
 
 class User(Base):
@@ -82,4 +104,4 @@ class User(Base):
     username = Column(String(64), nullable=False, unique=True)
     full_name = Column(String(128), nullable=True)
     password_hash = Column(String(256), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=utcnow)
@@ -5,7 +5,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class WatchlistBase(BaseModel):
@@ -26,8 +26,7 @@ class WatchlistRead(WatchlistBase):
     image_path: Path
     created_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DetectionBase(BaseModel):
@@ -42,14 +41,37 @@ class DetectionBase(BaseModel):
     metadata: Optional[Any] = Field(None, alias="event_metadata")
 
 
+class WatchlistRef(BaseModel):
+    """Minimal watchlist projection embedded in detection rows."""
+
+    id: int
+    label: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class DetectionRead(DetectionBase):
     id: int
     watchlist_entry_id: Optional[int]
+    watchlist_entry: Optional[WatchlistRef] = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+
+class DetectionListItem(DetectionBase):
+    """Flat row shape returned by the /detections column projection.
+
+    Unlike :class:`DetectionRead` there is no embedded watchlist reference,
+    and the metadata column appears under its mapped attribute name
+    (``event_metadata``), exactly as the projection emits it.
+    """
+
+    id: int
+    watchlist_entry_id: Optional[int] = None
     created_at: datetime
 
-    class Config:
-        orm_mode = True
-        allow_population_by_field_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class WatchlistResponse(BaseModel):
@@ -60,6 +82,10 @@ class DetectionResponse(BaseModel):
     items: List[DetectionRead]
 
 
+class DetectionListResponse(BaseModel):
+    items: List[DetectionListItem]
+
+
 class AlarmState(BaseModel):
     visual_alarm_active: bool
     last_alarm_at: Optional[datetime]
@@ -4,7 +4,6 @@ from __future__ import annotations
 import logging
 import threading
 import time
-from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
@@ -20,7 +19,7 @@ except Exception:  # pragma: no cover - optional dependency
 
 from ..config import settings
 from ..database import session_scope
-from ..models import AppState
+from ..models import AppState, utcnow
 
 LOGGER = logging.getLogger(__name__)
 
@@ -55,6 +54,37 @@ class AlarmManager:
             LOGGER.warning("simpleaudio no está disponible; la alarma sonora será omitida.")
         self.relay = RelayController(settings.alarm.relay_pin)
         self._lock = threading.Lock()
+        self._wave_obj = None
+        self._wave_mtime: Optional[float] = None
+        if self.enable_audio and self.sound_file is not None:
+            # Decoding the WAV once here keeps the file read and PCM copy
+            # out of the alarm path.
+            self._load_wave_object()
+
+    def _load_wave_object(self) -> None:
+        if self.sound_file is None or not self.sound_file.exists():
+            return
+        try:  # pragma: no cover - audio playback is optional
+            mtime = self.sound_file.stat().st_mtime
+            self._wave_obj = simpleaudio.WaveObject.from_wave_file(str(self.sound_file))
+            self._wave_mtime = mtime
+        except Exception as exc:
+            LOGGER.error("No se pudo cargar el sonido de alarma: %s", exc)
+            self._wave_obj = None
+            self._wave_mtime = None
+
+    def _get_wave_object(self):
+        """Return the preloaded WaveObject, reloading if the file changed."""
+
+        if self.sound_file is None or not self.sound_file.exists():
+            return None
+        try:
+            mtime = self.sound_file.stat().st_mtime
+        except OSError:
+            return None
+        if self._wave_obj is None or mtime != self._wave_mtime:
+            self._load_wave_object()
+        return self._wave_obj
 
     def trigger(self, reason: str) -> None:
         LOGGER.info("Activando alarmas por %s", reason)
@@ -62,13 +92,14 @@ class AlarmManager:
 
     def _handle_alarm(self, reason: str) -> None:
         with self._lock:
-            if self.enable_audio and self.sound_file and self.sound_file.exists():
-                try:  # pragma: no cover - audio playback is optional
-                    wave_obj = simpleaudio.WaveObject.from_wave_file(str(self.sound_file))
-                    play_obj = wave_obj.play()
-                    play_obj.wait_done()
-                except Exception as exc:
-                    LOGGER.error("No se pudo reproducir el sonido de alarma: %s", exc)
+            if self.enable_audio:
+                wave_obj = self._get_wave_object()
+                if wave_obj is not None:
+                    try:  # pragma: no cover - audio playback is optional
+                        play_obj = wave_obj.play()
+                        play_obj.wait_done()
+                    except Exception as exc:
+                        LOGGER.error("No se pudo reproducir el sonido de alarma: %s", exc)
             if settings.alarm.relay_active_seconds > 0:
                 self.relay.activate(settings.alarm.relay_active_seconds)
             self._set_visual_alarm(True)
@@ -79,5 +110,5 @@ class AlarmManager:
         with session_scope() as session:
             state = AppState.get_singleton(session)
             state.visual_alarm_active = active
-            state.last_alarm_at = datetime.utcnow()
+            state.last_alarm_at = utcnow()
             session.add(state)
@@ -3,7 +3,9 @@ from __future__ import annotations
 
 import hashlib
 import hmac
+import logging
 import os
+import time
 from typing import Optional
 
 from sqlalchemy.orm import Session
@@ -11,10 +13,36 @@ from sqlalchemy.orm import Session
 from ..database import session_scope
 from ..models import User
 
+LOGGER = logging.getLogger(__name__)
+
 _ALGORITHM = "pbkdf2_sha256"
 _ITERATIONS = 390_000
 
 
+def _probe_hash_speed() -> None:
+    """Warn once when PBKDF2 is unusually slow on this interpreter.
+
+    390k SHA-256 rounds take tens of ms with an OpenSSL build that uses the
+    CPU's SHA extensions, but hundreds of ms without them — enough to matter
+    for login latency. The probe extrapolates from a short run so module
+    import stays cheap.
+    """
+
+    probe_iterations = 20_000
+    start = time.perf_counter()
+    hashlib.pbkdf2_hmac("sha256", b"probe", b"0123456789abcdef", probe_iterations)
+    projected = (time.perf_counter() - start) * (_ITERATIONS / probe_iterations)
+    if projected > 0.25:
+        LOGGER.warning(
+            "PBKDF2 tardaría ~%.0f ms por verificación; la build de OpenSSL "
+            "no parece usar aceleración SHA del procesador.",
+            projected * 1000,
+        )
+
+
+_probe_hash_speed()
+
+
 def _pbkdf2(password: str, *, salt: bytes, iterations: int) -> bytes:
     return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
 
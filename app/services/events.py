@@ -2,12 +2,17 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
+import threading
+import time
 from pathlib import Path
-from typing import Any, Iterable, Optional
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
 
 from ..database import session_scope
-from ..models import DetectionEvent, WatchlistEntry
+from ..models import DetectionEvent, WatchlistEntry, utcnow
+from ..schemas import DetectionRead
 
 LOGGER = logging.getLogger(__name__)
 
@@ -21,7 +26,7 @@ def record_detection(
     match_score: float,
     snapshot_path: Optional[Path],
     metadata: Optional[dict[str, Any]] = None,
-) -> DetectionEvent:
+) -> DetectionRead:
     with session_scope() as session:
         event = DetectionEvent(
             watchlist_entry_id=watchlist_entry.id if watchlist_entry else None,
@@ -34,27 +39,144 @@ def record_detection(
             match_score=match_score,
             snapshot_path=snapshot_path.name if snapshot_path else None,
             event_metadata=metadata or {},
-            created_at=datetime.utcnow(),
+            created_at=utcnow(),
         )
         session.add(event)
         session.flush()
-        session.refresh(event)
-        session.expunge(event)
+        result = DetectionRead.model_validate(event)
+        _invalidate_events_cache()
         LOGGER.info("Evento registrado (match=%.2f) contra %s", match_score, watchlist_entry.label if watchlist_entry else "desconocido")
-        return event
+        return result
+
+
+class _DetectionBuffer:
+    """Buffers detection rows so bursts commit in one transaction.
+
+    A per-detection commit costs one fsync each; under an event burst that
+    serializes the writer at disk flush rate. Rows are flushed with a single
+    bulk insert once ``max_rows`` accumulate or ``flush_interval`` elapses.
+    """
+
+    def __init__(self, max_rows: int = 32, flush_interval: float = 0.5) -> None:
+        self.max_rows = max_rows
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._rows: List[Dict[str, Any]] = []
+        self._timer: Optional[threading.Timer] = None
+
+    def add(self, row: Dict[str, Any]) -> None:
+        flush_now = False
+        with self._lock:
+            self._rows.append(row)
+            if len(self._rows) >= self.max_rows:
+                flush_now = True
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if flush_now:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            rows, self._rows = self._rows, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        record_detections_bulk(rows)
+
+
+def record_detections_bulk(rows: List[Dict[str, Any]]) -> None:
+    """Insert many detection rows with one connection checkout and commit.
 
+    Rows use the mapping keys of :class:`DetectionEvent` (as built by
+    :func:`enqueue_detection`); a per-row session would pay one fsync each.
+    """
 
-def list_events(limit: int = 50) -> Iterable[DetectionEvent]:
+    if not rows:
+        return
     with session_scope() as session:
-        from sqlalchemy.orm import joinedload
+        session.bulk_insert_mappings(DetectionEvent, rows)
+    _invalidate_events_cache()
+    LOGGER.debug("Se registraron %d eventos en un solo commit", len(rows))
+
+
+_detection_buffer = _DetectionBuffer()
+
+
+def enqueue_detection(
+    *,
+    watchlist_entry: Optional[WatchlistEntry],
+    detected_label: Optional[str],
+    vehicle_type: Optional[str],
+    color_name: Optional[str],
+    match_score: float,
+    snapshot_path: Optional[Path],
+    metadata: Optional[dict[str, Any]] = None,
+) -> None:
+    """Queue a detection row for the next batched commit.
+
+    Unlike :func:`record_detection` this does not return the persisted
+    entity; the detection loop does not need it and skipping the flush +
+    refresh per row is the point.
+    """
+
+    _detection_buffer.add(
+        {
+            "watchlist_entry_id": watchlist_entry.id if watchlist_entry else None,
+            "detected_label": detected_label,
+            "vehicle_type": vehicle_type,
+            "color_name": color_name,
+            "model_name": watchlist_entry.model_name if watchlist_entry else None,
+            "has_logo": watchlist_entry.has_logo if watchlist_entry else False,
+            "is_person": watchlist_entry.is_person if watchlist_entry else False,
+            "match_score": match_score,
+            "snapshot_path": snapshot_path.name if snapshot_path else None,
+            "event_metadata": metadata or {},
+            "created_at": utcnow(),
+        }
+    )
+
+
+def flush_detections() -> None:
+    """Commit any buffered detection rows immediately."""
+
+    _detection_buffer.flush()
 
+
+#: Short-lived cache keyed by limit: events arrive in bursts, and the panel
+#: tolerates data up to a second old. Writes clear it on every flush.
+_EVENTS_CACHE_TTL = 1.0
+_events_cache: Dict[int, tuple[float, List[DetectionRead]]] = {}
+
+
+def _invalidate_events_cache() -> None:
+    _events_cache.clear()
+
+
+def list_events(limit: int = 50) -> List[DetectionRead]:
+    """Return recent events as schemas built while the session is open.
+
+    The joinedload keeps ``watchlist_entry`` populated for the embedded
+    reference; converting before the session closes rules out lazy loads on
+    detached objects. Results are reused for up to a second unless a write
+    invalidates them first.
+    """
+
+    cached = _events_cache.get(limit)
+    if cached is not None and (time.monotonic() - cached[0]) <= _EVENTS_CACHE_TTL:
+        return cached[1]
+    with session_scope() as session:
         events = (
-            session.query(DetectionEvent)
-            .options(joinedload(DetectionEvent.watchlist_entry))
-            .order_by(DetectionEvent.created_at.desc())
-            .limit(limit)
+            session.execute(
+                select(DetectionEvent)
+                .options(joinedload(DetectionEvent.watchlist_entry))
+                .order_by(DetectionEvent.created_at.desc())
+                .limit(limit)
+            )
+            .scalars()
             .all()
         )
-        for event in events:
-            session.expunge(event)
-        return events
+        items = [DetectionRead.model_validate(event) for event in events]
+    _events_cache[limit] = (time.monotonic(), items)
+    return items
@@ -2,27 +2,232 @@
 from __future__ import annotations
 
 import logging
+import os
+import shutil
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, Optional
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
 
 import cv2
+import numpy as np
+from sqlalchemy import select
 
 from ..config import settings
 from ..database import session_scope
 from ..models import WatchlistEntry
-from .features import build_feature_vector, dominant_color_name
+from ..schemas import WatchlistRead
+from .features import (
+    FeatureVector,
+    build_feature_vector,
+    centered_unit_histogram,
+    dominant_color_name,
+    quantize_unit_vector,
+)
 
 LOGGER = logging.getLogger(__name__)
 
 
-def list_watchlist() -> Iterable[WatchlistEntry]:
+#: Rendered-list cache for the dashboard: reused until a mutation bumps the
+#: cache version or the TTL covers cross-process edits.
+_LIST_CACHE_TTL = 5.0
+_list_cache: Optional[Tuple[float, int, List[WatchlistRead]]] = None
+
+
+def list_watchlist() -> List[WatchlistRead]:
+    """Return the watchlist as schemas built while the session is open.
+
+    Converting inside the session means no detached ORM objects leave the
+    service, so consumers can never trigger hidden lazy loads. Results are
+    cached alongside the detection-loop cache version, so repeated panel
+    renders between edits skip the query entirely.
+    """
+
+    global _list_cache
+    version = watchlist_cache.version
+    now = time.monotonic()
+    if _list_cache is not None:
+        loaded_at, cached_version, items = _list_cache
+        if cached_version == version and (now - loaded_at) <= _LIST_CACHE_TTL:
+            return items
+    with session_scope() as session:
+        entries = (
+            session.execute(
+                select(WatchlistEntry).order_by(WatchlistEntry.created_at.desc())
+            )
+            .scalars()
+            .all()
+        )
+        items = [WatchlistRead.model_validate(entry) for entry in entries]
+    _list_cache = (now, version, items)
+    return items
+
+
+def _load_entries() -> List[WatchlistEntry]:
+    """Load detached entries for the detection loop cache.
+
+    The cache needs the raw ``feature_vector`` column, which the read schema
+    deliberately does not expose, so this stays on ORM objects.
+    """
+
     with session_scope() as session:
-        entries = session.query(WatchlistEntry).order_by(WatchlistEntry.created_at.desc()).all()
+        entries = (
+            session.execute(
+                select(WatchlistEntry).order_by(WatchlistEntry.created_at.desc())
+            )
+            .scalars()
+            .all()
+        )
         for entry in entries:
             session.expunge(entry)
         return entries
 
 
+def _parse_entry_features(entry: WatchlistEntry) -> Optional[FeatureVector]:
+    """Parse the stored feature JSON once per cached entry instance.
+
+    The parsed vector is stashed on the entry so every consumer — the SoA
+    matrices built below and the detector's per-entry fallback — shares a
+    single JSON→ndarray conversion for the lifetime of the cached object.
+    """
+
+    if not entry.feature_vector:
+        return None
+    features = getattr(entry, "_parsed_features", None)
+    if features is None:
+        features = FeatureVector.from_dict(entry.feature_vector)
+        entry._parsed_features = features
+    return features
+
+
+@dataclass
+class WatchlistMatrices:
+    """Structure-of-arrays view of the watchlist features.
+
+    Rows are aligned with the entry list the matrices were built from, so a
+    detection can be scored against every entry with one matrix-vector
+    product instead of a Python loop.
+    """
+
+    hist_q: np.ndarray  # (N, D) int8, centered/normalized rows quantized per row
+    hist_scale: np.ndarray  # (N,) float32 dequantization scales
+    average_color: np.ndarray  # (N, 3) float32
+    edge_density: np.ndarray  # (N,) float32
+    has_features: np.ndarray  # (N,) bool
+    is_person: np.ndarray  # (N,) bool
+    vehicle_type: np.ndarray  # (N,) unicode, "" when unset
+    color_name: np.ndarray  # (N,) unicode lowercased, "" when unset
+    has_color: np.ndarray  # (N,) bool
+    has_logo: np.ndarray  # (N,) bool
+    #: Per-class eligibility masks memoized by the detector; rebuilt with the
+    #: matrices so they can never go stale.
+    type_masks: Dict[str, np.ndarray] = field(default_factory=dict, repr=False)
+
+
+def _build_matrices(entries: List[WatchlistEntry]) -> Optional[WatchlistMatrices]:
+    if not entries:
+        return None
+    vectors = [_parse_entry_features(entry) for entry in entries]
+    dims = {np.asarray(vector.color_hist).size for vector in vectors if vector is not None}
+    if len(dims) != 1:
+        # No usable features, or histograms of mixed sizes from older rows;
+        # the detector falls back to per-entry comparison.
+        return None
+    dim = dims.pop()
+    hist_q = np.zeros((len(entries), dim), dtype=np.int8)
+    hist_scale = np.zeros(len(entries), dtype=np.float32)
+    average_color = np.zeros((len(entries), 3), dtype=np.float32)
+    edge_density = np.zeros(len(entries), dtype=np.float32)
+    has_features = np.zeros(len(entries), dtype=bool)
+    for index, vector in enumerate(vectors):
+        if vector is None:
+            continue
+        hist_q[index], hist_scale[index] = quantize_unit_vector(
+            centered_unit_histogram(vector.color_hist)
+        )
+        average_color[index] = vector.average_color
+        edge_density[index] = vector.edge_density
+        has_features[index] = True
+    is_person = np.array([bool(entry.is_person) for entry in entries], dtype=bool)
+    vehicle_type = np.array(
+        [(entry.vehicle_type or "").lower() for entry in entries], dtype=np.str_
+    )
+    color_name = np.array(
+        [(entry.color_name or "").lower() for entry in entries], dtype=np.str_
+    )
+    has_logo = np.array([bool(entry.has_logo) for entry in entries], dtype=bool)
+    return WatchlistMatrices(
+        hist_q=hist_q,
+        hist_scale=hist_scale,
+        average_color=average_color,
+        edge_density=edge_density,
+        has_features=has_features,
+        is_person=is_person,
+        vehicle_type=vehicle_type,
+        color_name=color_name,
+        has_color=color_name != "",
+        has_logo=has_logo,
+    )
+
+
+class WatchlistCache:
+    """In-memory copy of the watchlist for the per-frame detection loop.
+
+    The detection loop used to re-query the full watchlist on every processed
+    frame even though the list only changes when someone edits it from the
+    panel. The cache keeps the detached entries in memory and only reloads
+    when the version counter is bumped by a mutation in this process, or when
+    the TTL expires (which covers mutations made from another process, e.g.
+    the web panel while the detector runner is active).
+    """
+
+    def __init__(self, ttl_seconds: float = 5.0) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._lock = Lock()
+        self._version = 0
+        self._loaded_version = -1
+        self._loaded_at = 0.0
+        self._entries: List[WatchlistEntry] = []
+        self._matrices: Optional[WatchlistMatrices] = None
+
+    def invalidate(self) -> None:
+        """Mark the cached entries as stale after a watchlist mutation."""
+
+        with self._lock:
+            self._version += 1
+
+    @property
+    def version(self) -> int:
+        """Monotonic counter bumped by every in-process mutation."""
+
+        with self._lock:
+            return self._version
+
+    def _refresh_locked(self) -> None:
+        expired = (time.monotonic() - self._loaded_at) > self.ttl_seconds
+        if self._loaded_version != self._version or expired:
+            self._entries = _load_entries()
+            self._matrices = _build_matrices(self._entries)
+            self._loaded_version = self._version
+            self._loaded_at = time.monotonic()
+
+    def get_entries(self) -> List[WatchlistEntry]:
+        """Return the cached entries, reloading them only when stale."""
+
+        return self.snapshot()[0]
+
+    def snapshot(self) -> Tuple[List[WatchlistEntry], Optional[WatchlistMatrices]]:
+        """Return the cached entries together with their feature matrices."""
+
+        with self._lock:
+            self._refresh_locked()
+            return self._entries, self._matrices
+
+
+watchlist_cache = WatchlistCache()
+
+
 def create_watchlist_entry(
     label: str,
     image_path: Path,
@@ -31,12 +236,22 @@ def create_watchlist_entry(
     model_name: Optional[str] = None,
     has_logo: bool = False,
     is_person: bool = False,
-) -> WatchlistEntry:
+    copy: bool = False,
+) -> WatchlistRead:
     settings.watchlist_dir.mkdir(parents=True, exist_ok=True)
     image_path = Path(image_path)
     image_destination = settings.watchlist_dir / image_path.name
     if image_path != image_destination:
-        image_destination.write_bytes(image_path.read_bytes())
+        if copy:
+            # Preserves the source; copyfile uses sendfile on Linux.
+            shutil.copyfile(image_path, image_destination)
+        else:
+            try:
+                # Atomic rename: no bytes are read or rewritten when source
+                # and destination live on the same filesystem.
+                os.replace(image_path, image_destination)
+            except OSError:
+                shutil.copyfile(image_path, image_destination)
     image = cv2.imread(str(image_destination))
     if image is None:
         raise ValueError("No se pudo leer la imagen proporcionada")
@@ -58,15 +273,16 @@ def create_watchlist_entry(
         )
         session.add(entry)
         session.flush()
-        session.refresh(entry)
-        session.expunge(entry)
+        result = WatchlistRead.model_validate(entry)
         LOGGER.info("Agregado a la lista de vigilancia: %s", label)
-        return entry
+    watchlist_cache.invalidate()
+    return result
 
 
 def delete_watchlist_entry(entry_id: int) -> None:
     with session_scope() as session:
-        entry = session.query(WatchlistEntry).get(entry_id)
+        entry = session.get(WatchlistEntry, entry_id)
         if entry:
             session.delete(entry)
             LOGGER.info("Entrada eliminada: %s", entry.label)
+    watchlist_cache.invalidate()
@@ -6,10 +6,12 @@ from typing import Optional
 from urllib.parse import quote, unquote
 from uuid import uuid4
 
-from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile, status
-from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse
+from fastapi import APIRouter, File, Form, Request, UploadFile, status
+from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
 
+from ..api.routes import UPLOAD_CHUNK_SIZE
 from ..config import settings
 from ..services import auth as auth_service
 from ..services import camera as camera_service
@@ -56,9 +58,9 @@ async def dashboard(request: Request):
     detections = events_service.list_events()
     camera_state = camera_service.get_state()
     return templates.TemplateResponse(
+        request,
         "dashboard.html",
         {
-            "request": request,
             "watchlist": watchlist,
             "detections": detections,
             "camera_state": camera_state,
@@ -84,8 +86,13 @@ async def upload_watchlist_item(
 
     filename = f"{uuid4().hex}_{image.filename}"
     destination = settings.watchlist_dir / filename
-    destination.write_bytes(await image.read())
-    watchlist_service.create_watchlist_entry(
+    # Stream in chunks so multi-MB uploads never materialize in memory.
+    with destination.open("wb") as buffer:
+        while chunk := await image.read(UPLOAD_CHUNK_SIZE):
+            buffer.write(chunk)
+    # Feature extraction reads the image with OpenCV; keep it off the loop.
+    await run_in_threadpool(
+        watchlist_service.create_watchlist_entry,
         label=label,
         image_path=destination,
         vehicle_type=vehicle_type,
@@ -104,10 +111,9 @@ async def login_page(request: Request, next: str | None = None):
         return RedirectResponse(url="/panel", status_code=status.HTTP_303_SEE_OTHER)
 
     context = {
-        "request": request,
         "next_url": _safe_next_url(next),
     }
-    return templates.TemplateResponse("login.html", context)
+    return templates.TemplateResponse(request, "login.html", context)
 
 
 @router.post("/login")
@@ -117,15 +123,16 @@ async def login_action(
     password: str = Form(...),
     next: str | None = Form(None),
 ):
-    user = auth_service.authenticate_user(username, password)
+    # Password hashing is intentionally slow; keep it off the event loop.
+    user = await run_in_threadpool(auth_service.authenticate_user, username, password)
     if user is None:
         context = {
-            "request": request,
             "next_url": _safe_next_url(next),
             "form_username": username,
             "error": "Credenciales inválidas. Verifica tus datos e inténtalo nuevamente.",
         }
         return templates.TemplateResponse(
+            request,
             "login.html",
             context,
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -145,10 +152,9 @@ async def register_page(request: Request, next: str | None = None):
         return RedirectResponse(url="/panel", status_code=status.HTTP_303_SEE_OTHER)
 
     context = {
-        "request": request,
         "next_url": _safe_next_url(next),
     }
-    return templates.TemplateResponse("register.html", context)
+    return templates.TemplateResponse(request, "register.html", context)
 
 
 @router.post("/register")
@@ -162,29 +168,31 @@ async def register_action(
 ):
     if password != confirm_password:
         context = {
-            "request": request,
             "next_url": _safe_next_url(next),
             "form_username": username,
             "form_full_name": full_name,
             "error": "Las contraseñas no coinciden.",
         }
         return templates.TemplateResponse(
+            request,
             "register.html",
             context,
             status_code=status.HTTP_400_BAD_REQUEST,
         )
 
     try:
-        user = auth_service.create_user(username, password, full_name=full_name)
+        user = await run_in_threadpool(
+            auth_service.create_user, username, password, full_name=full_name
+        )
     except ValueError as exc:
         context = {
-            "request": request,
             "next_url": _safe_next_url(next),
             "form_username": username,
             "form_full_name": full_name,
             "error": str(exc),
         }
         return templates.TemplateResponse(
+            request,
             "register.html",
             context,
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -203,17 +211,3 @@ async def logout(request: Request):
     return RedirectResponse(url="/login", status_code=status.HTTP_303_SEE_OTHER)
 
 
-@router.get("/media/watchlist/{filename}", name="watchlist_image")
-async def watchlist_image(filename: str):
-    path = settings.watchlist_dir / filename
-    if not path.exists():
-        raise HTTPException(status_code=404, detail="Imagen no encontrada")
-    return FileResponse(path)
-
-
-@router.get("/media/detections/{filename}", name="detection_image")
-async def detection_image(filename: str):
-    path = settings.detections_dir / filename
-    if not path.exists():
-        raise HTTPException(status_code=404, detail="Captura no encontrada")
-    return FileResponse(path)